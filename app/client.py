@@ -1,80 +1,600 @@
+import asyncio
+import atexit
 import chromadb
+from chromadb.api.base_http_client import BaseHTTPClient
 from chromadb.config import Settings
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import hashlib
+import itertools
+import json
+import random
+import secrets
+import threading
 import time
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 import os
+import queue
+import numpy as np
+import httpx
 
-# Setup logging
+class JsonFormatter(logging.Formatter):
+    """Render log records as single-line JSON for machine ingestion."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "name": record.name,
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+# Setup logging; LOG_FORMAT=json switches to structured output
+_log_handler = logging.StreamHandler()
+if os.environ.get("LOG_FORMAT", "").lower() == "json":
+    _log_handler.setFormatter(JsonFormatter())
+else:
+    _log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+    handlers=[_log_handler]
 )
 logger = logging.getLogger(__name__)
 
-class ChromaDBClient:
-    """A wrapper class for ChromaDB operations with enhanced error handling and retries."""
+# Errors that mean the connection dropped, so a reconnect and retry may succeed
+_TRANSPORT_ERRORS = (ConnectionError, httpx.TransportError)
+
+# Validated once at import; HttpClient writes host/port into its settings, so each client gets a copy
+_DEFAULT_SETTINGS = Settings(allow_reset=True, anonymized_telemetry=False)
+
+
+def _client_settings(allow_reset: bool, anonymized_telemetry: bool) -> Settings:
+    """Return a per-client copy of the default settings with any overrides applied."""
+    return _DEFAULT_SETTINGS.copy(
+        update={"allow_reset": allow_reset, "anonymized_telemetry": anonymized_telemetry}
+    )
+
+
+class SemanticQueryCache:
+    """An approximate query cache that matches new queries to past ones by embedding similarity.
+    
+    Vectors live in a preallocated (maxsize, d) buffer; entries older than ttl seconds are
+    never returned, so stale results expire just like the exact-match cache.
+    """
     
     def __init__(
-        self, 
-        host: str = "chroma", 
+        self,
+        threshold: float = 0.95,
+        maxsize: int = 5000,
+        embedding_function: Any = None,
+        ttl: Optional[float] = None
+    ):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._embedding_function = embedding_function
+        self._vectors: Optional[np.ndarray] = None
+        self._used = np.zeros(maxsize, dtype=bool)
+        self._stored_at = np.zeros(maxsize, dtype=np.float64)
+        self._last_used = np.zeros(maxsize, dtype=np.int64)
+        self._contexts: List[Optional[tuple]] = [None] * maxsize
+        self._results: List[Optional[Dict[str, Any]]] = [None] * maxsize
+        self._clock = 0
+        self._lock = threading.RLock()
+    
+    def embed(self, query_text: str) -> np.ndarray:
+        """Embed a query and normalize it to unit length."""
+        if self._embedding_function is None:
+            self._embedding_function = DefaultEmbeddingFunction()
+        return self.normalize(self._embedding_function([query_text])[0])
+    
+    @staticmethod
+    def normalize(vector: Any) -> np.ndarray:
+        """Scale an embedding to unit length as float32."""
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def get(self, context: tuple, vector: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Return the cached result of the most similar past query, if it clears the threshold."""
+        with self._lock:
+            if self._vectors is None or vector.shape[-1] != self._vectors.shape[1]:
+                return None
+            self._expire()
+            candidates = np.flatnonzero(self._used)
+            candidates = [i for i in candidates if self._contexts[i] == context]
+            if not candidates:
+                return None
+            sims = self._vectors[candidates] @ vector
+            best = int(sims.argmax())
+            if sims[best] < self.threshold:
+                return None
+            slot = candidates[best]
+            self._clock += 1
+            self._last_used[slot] = self._clock
+            return self._results[slot]
+    
+    def put(self, context: tuple, vector: np.ndarray, result: Dict[str, Any]) -> None:
+        """Store a query result, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if self._vectors is None or vector.shape[-1] != self._vectors.shape[1]:
+                # First entry, or the embedding function changed dimension: start over
+                self._vectors = np.zeros((self.maxsize, vector.shape[-1]), dtype=np.float32)
+                self._release(list(range(self.maxsize)))
+            self._expire()
+            free = np.flatnonzero(~self._used)
+            if len(free):
+                slot = int(free[0])
+            else:
+                slot = int(np.argmin(self._last_used))
+            self._clock += 1
+            self._vectors[slot] = vector
+            self._used[slot] = True
+            self._stored_at[slot] = time.monotonic()
+            self._last_used[slot] = self._clock
+            self._contexts[slot] = context
+            self._results[slot] = result
+    
+    def invalidate(self, collection_name: Optional[str] = None) -> None:
+        """Drop entries for one collection, or all entries."""
+        with self._lock:
+            if collection_name is None:
+                self._release(list(range(self.maxsize)))
+            else:
+                self._release([i for i, c in enumerate(self._contexts) if c is not None and c[0] == collection_name])
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._used.sum())
+    
+    def _expire(self) -> None:
+        if self.ttl is None:
+            return
+        expired = self._used & (time.monotonic() - self._stored_at >= self.ttl)
+        self._release(np.flatnonzero(expired).tolist())
+    
+    def _release(self, slots: List[int]) -> None:
+        for i in slots:
+            self._used[i] = False
+            self._contexts[i] = None
+            self._results[i] = None
+
+
+class CircuitBreaker:
+    """Fails fast after repeated connection failures instead of retrying into an outage.
+    
+    Use ``CircuitBreaker.for_endpoint`` so clients of the same server share one breaker
+    while an outage on one host leaves the others untouched.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    _registry: Dict[Tuple[str, int], "CircuitBreaker"] = {}
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def for_endpoint(cls, host: str, port: int) -> "CircuitBreaker":
+        """Return the breaker shared by every client of host:port."""
+        with cls._registry_lock:
+            breaker = cls._registry.get((host, port))
+            if breaker is None:
+                breaker = cls._registry[(host, port)] = cls()
+            return breaker
+    
+    def _remaining(self) -> float:
+        return self.reset_timeout - (time.monotonic() - self.opened_at)
+    
+    def allow_request(self) -> None:
+        """Admit a connection attempt, raising ConnectionError while the breaker rejects it.
+        
+        Once the timeout has passed, exactly one caller is let through as the half-open
+        trial; everyone else fails fast until that trial is recorded. A trial that is never
+        recorded is replaced after another reset_timeout.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            remaining = self._remaining()
+            if remaining > 0:
+                if self.state == self.HALF_OPEN:
+                    raise ConnectionError("Circuit breaker half-open; a trial connection is already in progress")
+                raise ConnectionError(f"Circuit breaker open; not contacting ChromaDB for another {remaining:.1f}s")
+            self.state = self.HALF_OPEN
+            self.opened_at = time.monotonic()
+    
+    @property
+    def closed(self) -> bool:
+        return self.state == self.CLOSED
+    
+    def record_success(self) -> None:
+        """Close the breaker and reset the failure count."""
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+    
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker at the threshold or on a failed trial."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                logger.warning("Circuit breaker opened after %d consecutive failures", self.failures)
+
+
+class _BaseChromaDBClient:
+    """State and I/O-free helpers shared by ChromaDBClient and AsyncChromaDBClient.
+    
+    Subclasses only add the calls to chromadb, synchronous or awaited.
+    """
+    
+    def __init__(
+        self,
+        host: str = "chroma",
         port: int = 8000,
         max_retries: int = 5,
         retry_delay: int = 2,
         allow_reset: bool = True,
-        anonymized_telemetry: bool = False
+        anonymized_telemetry: bool = False,
+        cache_maxsize: int = 2000,
+        cache_ttl: int = 600,
+        retry_cap: int = 30,
+        ssl: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        rng: Optional[random.Random] = None,
+        heartbeat_timeout: float = 1.5,
+        embedding_function: Optional[Any] = None,
+        embedding_cache_ttl: int = 3600
     ):
         self.host = host
         self.port = port
+        self.ssl = ssl
+        self.headers = headers
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.settings = Settings(
+        self.retry_cap = retry_cap
+        self.heartbeat_timeout = heartbeat_timeout
+        self._rng = rng or random.Random()
+        self._breaker = CircuitBreaker.for_endpoint(host, port)
+        self.settings = _client_settings(allow_reset, anonymized_telemetry)
+        self.client = None
+        self.max_batch_size = None
+        self._collections: Dict[str, Any] = {}
+        # Critical sections never await, so a thread lock also serves the async client
+        # cache_maxsize=0 disables caching; TTLCache itself would reject every insert
+        self._query_cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl) if cache_maxsize > 0 else None
+        self._cache_lock = threading.RLock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # A Chroma-compatible embedding function lets queries be embedded locally and cached
+        self.embedding_function = embedding_function
+        self._embedding_cache = TTLCache(maxsize=cache_maxsize, ttl=embedding_cache_ttl) if cache_maxsize > 0 else None
+    
+    def _backoff_delay(self, attempts: int) -> float:
+        """Exponential backoff with full jitter, capped at retry_cap seconds."""
+        return self._rng.uniform(0, min(self.retry_cap, self.retry_delay * (2 ** attempts)))
+    
+    def _heartbeat_url(self) -> str:
+        """Return the heartbeat URL, with the same scheme and API path chromadb's client uses."""
+        api_url = BaseHTTPClient.resolve_url(
+            chroma_server_host=self.host,
+            chroma_server_http_port=self.port,
+            chroma_server_ssl_enabled=self.ssl,
+            default_api_path=self.settings.chroma_server_api_default_path
+        )
+        return f"{api_url}/heartbeat"
+    
+    def _ssl_verify(self) -> Union[bool, str]:
+        """Return the TLS verification setting chromadb's client would use."""
+        verify = self.settings.chroma_server_ssl_verify
+        return True if verify is None else verify
+    
+    def _log_connect_attempt(self, attempts: int) -> None:
+        logger.info("Connecting to ChromaDB at %s:%s (attempt %d/%d)", self.host, self.port, attempts+1, self.max_retries)
+    
+    def _on_connected(self, max_batch_size: Optional[int]) -> None:
+        """Record a successful connection."""
+        self.max_batch_size = max_batch_size
+        self._collections.clear()
+        self._breaker.record_success()
+        logger.info("Successfully connected to ChromaDB")
+    
+    def _on_connect_failure(self, attempts: int, error: Exception) -> None:
+        """Record a failed connection attempt, raising once retries are exhausted."""
+        self._breaker.record_failure()
+        logger.warning("Connection attempt %d failed: %s", attempts, error)
+        if attempts >= self.max_retries:
+            logger.error("Failed to connect after %d attempts", self.max_retries)
+            raise ConnectionError(f"Could not connect to ChromaDB: {str(error)}")
+    
+    def _on_collection_failure(self, attempts: int, error: Exception) -> bool:
+        """Log a failed collection access; re-raise once retries are exhausted.
+        
+        Returns True when the caller should reconnect before the next attempt.
+        """
+        logger.warning("Collection access attempt %d failed: %s", attempts, error)
+        if attempts >= self.max_retries:
+            logger.error("Failed to access collection after %d attempts", self.max_retries)
+            raise error
+        return attempts % 2 == 0
+    
+    def _on_batch_transport_error(self, attempts: int, error: Exception) -> None:
+        """Log a dropped connection during a batch write; re-raise once retries are exhausted."""
+        logger.warning("Batch add attempt %d failed: %s", attempts, error)
+        if attempts >= self.max_retries:
+            logger.error("Failed to add documents after %d attempts", self.max_retries)
+            raise error
+    
+    def _on_operation_error(self, collection_name: str, action: str, error: Exception) -> None:
+        """Drop the possibly stale collection handle after a failed operation."""
+        self._collections.pop(collection_name, None)
+        logger.error("Failed to %s: %s", action, error)
+    
+    @staticmethod
+    def _generate_ids(n: int) -> List[str]:
+        """Generate n random hex IDs from a single random read."""
+        buf = secrets.token_bytes(16 * n)
+        return [buf[i * 16:(i + 1) * 16].hex() for i in range(n)]
+    
+    def _batches(
+        self,
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]],
+        ids: Optional[List[str]],
+        embeddings: Optional[Union[List[List[float]], np.ndarray]],
+        batch_size: int
+    ) -> Iterator[tuple]:
+        """Yield (start, end, write kwargs) for each batch of an add_documents call."""
+        n = len(documents)
+        if embeddings is not None and not (isinstance(embeddings, np.ndarray) and embeddings.dtype == np.float32):
+            # Convert once so batches slice a contiguous float32 array instead of boxed floats
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+        if ids is None:
+            ids = self._generate_ids(n)
+        if self.max_batch_size:
+            batch_size = min(batch_size, self.max_batch_size)
+        
+        for start in range(0, n, batch_size):
+            end = min(start + batch_size, n)
+            yield start, end, {
+                "documents": documents[start:end],
+                "metadatas": metadatas[start:end] if metadatas is not None else None,
+                "ids": ids[start:end],
+                "embeddings": embeddings[start:end] if embeddings is not None else None
+            }
+    
+    @staticmethod
+    def _query_cache_key(
+        collection_name: str,
+        query_texts: List[str],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        where_document: Optional[Dict[str, Any]]
+    ) -> tuple:
+        """Build a query cache key; the collection name is kept separate for invalidation."""
+        payload = json.dumps(
+            [collection_name, query_texts, n_results, where, where_document],
+            sort_keys=True
+        ).encode()
+        return collection_name, hashlib.blake2b(payload).digest()
+    
+    def invalidate_cache(self, collection_name: Optional[str] = None) -> None:
+        """Drop cached query results for one collection, or for all collections."""
+        if self._query_cache is None:
+            return
+        with self._cache_lock:
+            if collection_name is None:
+                self._query_cache.clear()
+                return
+            for key in [k for k in self._query_cache.keys() if k[0] == collection_name]:
+                self._query_cache.pop(key, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return query cache hit/miss statistics."""
+        with self._cache_lock:
+            total = self._cache_hits + self._cache_misses
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "hit_rate": self._cache_hits / total if total else 0.0
+            }
+    
+    def _get_cached(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of an exact-match cached result, if present."""
+        if self._query_cache is None:
+            return None
+        with self._cache_lock:
+            cached = self._query_cache.get(key)
+            if cached is None:
+                return None
+            self._cache_hits += 1
+        logger.info("Cache hit for query on collection '%s'", key[0])
+        return copy.deepcopy(cached)
+    
+    def _count_hit(self) -> None:
+        with self._cache_lock:
+            self._cache_hits += 1
+    
+    def _count_miss(self) -> None:
+        with self._cache_lock:
+            self._cache_misses += 1
+    
+    def _store_cached(self, key: tuple, results: Dict[str, Any]) -> None:
+        if self._query_cache is None:
+            return
+        with self._cache_lock:
+            self._query_cache[key] = copy.deepcopy(results)
+    
+    def _embed_query(self, query_text: str) -> np.ndarray:
+        """Embed a query text locally, reusing cached embeddings."""
+        if self._embedding_cache is None:
+            return np.asarray(self.embedding_function([query_text])[0], dtype=np.float32)
+        key = hashlib.sha256(query_text.encode()).digest()
+        with self._cache_lock:
+            cached = self._embedding_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        vector = np.asarray(self.embedding_function([query_text])[0], dtype=np.float32)
+        with self._cache_lock:
+            self._embedding_cache[key] = vector
+        return vector
+    
+    def _collection_kwargs(self) -> Dict[str, Any]:
+        """Extra get_or_create_collection arguments.
+        
+        Documents must be embedded with the same function used for local query embedding.
+        """
+        return {"embedding_function": self.embedding_function} if self.embedding_function is not None else {}
+    
+    @staticmethod
+    def _merge_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge single-query results into one multi-query result."""
+        merged = {}
+        for field, value in results[0].items():
+            if field == "included" or not isinstance(value, list):
+                merged[field] = value
+            else:
+                merged[field] = [result[field][0] for result in results]
+        return merged
+
+
+class ChromaDBClient(_BaseChromaDBClient):
+    """A wrapper class for ChromaDB operations with enhanced error handling and retries."""
+    
+    def __init__(
+        self,
+        host: str = "chroma",
+        port: int = 8000,
+        max_retries: int = 5,
+        retry_delay: int = 2,
+        allow_reset: bool = True,
+        anonymized_telemetry: bool = False,
+        cache_maxsize: int = 2000,
+        cache_ttl: int = 600,
+        retry_cap: int = 30,
+        ssl: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        rng: Optional[random.Random] = None,
+        semantic_cache: bool = False,
+        semantic_threshold: float = 0.95,
+        query_workers: int = 4,
+        heartbeat_timeout: float = 1.5,
+        embedding_function: Optional[Any] = None,
+        embedding_cache_ttl: int = 3600
+    ):
+        super().__init__(
+            host=host,
+            port=port,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+            retry_cap=retry_cap,
             allow_reset=allow_reset,
             anonymized_telemetry=anonymized_telemetry,
-            chroma_api_impl="rest"
+            cache_maxsize=cache_maxsize,
+            cache_ttl=cache_ttl,
+            ssl=ssl,
+            headers=headers,
+            rng=rng,
+            heartbeat_timeout=heartbeat_timeout,
+            embedding_function=embedding_function,
+            embedding_cache_ttl=embedding_cache_ttl
         )
-        self.client = None
+        self._semantic_cache = (
+            SemanticQueryCache(threshold=semantic_threshold, embedding_function=embedding_function, ttl=cache_ttl)
+            if semantic_cache else None
+        )
+        self._executor = ThreadPoolExecutor(max_workers=query_workers, thread_name_prefix="chroma-query")
         self._connect()
     
     def _connect(self) -> None:
         """Establish connection to ChromaDB with retries."""
         attempts = 0
         while attempts < self.max_retries:
+            self._breaker.allow_request()
             try:
-                logger.info(f"Connecting to ChromaDB at {self.host}:{self.port} (attempt {attempts+1}/{self.max_retries})")
+                self._log_connect_attempt(attempts)
+                # HttpClient() already talks to the server, so check liveness first with a hard deadline
+                self._preflight()
                 self.client = chromadb.HttpClient(
                     host=self.host,
                     port=self.port,
+                    ssl=self.ssl,
+                    headers=self.headers,
                     settings=self.settings
                 )
-                self.client.heartbeat()
-                logger.info("Successfully connected to ChromaDB")
+                self._on_connected(self._get_max_batch_size())
                 return
             except Exception as e:
                 attempts += 1
-                logger.warning(f"Connection attempt {attempts} failed: {str(e)}")
-                if attempts >= self.max_retries:
-                    logger.error(f"Failed to connect after {self.max_retries} attempts")
-                    raise ConnectionError(f"Could not connect to ChromaDB: {str(e)}")
-                time.sleep(self.retry_delay)
+                self._on_connect_failure(attempts, e)
+                time.sleep(self._backoff_delay(attempts))
+    
+    def _preflight(self) -> None:
+        """GET the heartbeat endpoint with a short timeout so a stuck server fails fast."""
+        response = httpx.get(
+            self._heartbeat_url(),
+            headers=self.headers,
+            verify=self._ssl_verify(),
+            timeout=self.heartbeat_timeout
+        )
+        response.raise_for_status()
+    
+    def _get_max_batch_size(self) -> Optional[int]:
+        """Return the server's maximum batch size, if the client exposes it."""
+        try:
+            return self.client.get_max_batch_size()
+        except Exception as e:
+            logger.warning("Could not determine max batch size: %s", e)
+            return None
+    
+    def invalidate_cache(self, collection_name: Optional[str] = None) -> None:
+        """Drop cached query results for one collection, or for all collections."""
+        if self._semantic_cache is not None:
+            self._semantic_cache.invalidate(collection_name)
+        super().invalidate_cache(collection_name)
     
     def get_or_create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None) -> Any:
-        """Get or create a collection with retries."""
+        """Get or create a collection with retries, reusing cached handles."""
+        if name in self._collections:
+            return self._collections[name]
+        
+        if not self._breaker.closed:
+            # Reconnect through the breaker so a half-open trial is admitted once and recorded
+            self._connect()
+        kwargs = self._collection_kwargs()
         attempts = 0
         while attempts < self.max_retries:
             try:
-                collection = self.client.get_or_create_collection(name=name, metadata=metadata)
-                logger.info(f"Collection '{name}' accessed successfully")
+                collection = self.client.get_or_create_collection(name=name, metadata=metadata, **kwargs)
+                self._collections[name] = collection
+                logger.info("Collection '%s' accessed successfully", name)
                 return collection
             except Exception as e:
                 attempts += 1
-                logger.warning(f"Collection access attempt {attempts} failed: {str(e)}")
-                if attempts >= self.max_retries:
-                    logger.error(f"Failed to access collection after {self.max_retries} attempts")
-                    raise
-                time.sleep(self.retry_delay)
+                reconnect = self._on_collection_failure(attempts, e)
+                time.sleep(self._backoff_delay(attempts))
                 
-                if attempts % 2 == 0:
+                if reconnect:
                     logger.info("Attempting to reconnect to ChromaDB")
                     self._connect()
     
@@ -84,158 +604,683 @@ class ChromaDBClient:
         documents: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
         ids: Optional[List[str]] = None,
-        embeddings: Optional[List[List[float]]] = None
+        embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
+        batch_size: int = 5000,
+        upsert: bool = True
     ) -> None:
-        """Add documents to a collection with proper error handling."""
+        """Add documents to a collection in batches with proper error handling.
+        
+        With upsert=True (the default) existing IDs are overwritten instead of raising.
+        """
         collection = self.get_or_create_collection(collection_name)
+        n = len(documents)
         
+        # Earlier batches may already be written when a later one fails
         try:
-            if ids is None:
-                import uuid
-                ids = [str(uuid.uuid4()) for _ in range(len(documents))]
-            
-            collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids,
-                embeddings=embeddings
-            )
-            logger.info(f"Successfully added {len(documents)} documents to '{collection_name}'")
+            for start, end, batch in self._batches(documents, metadatas, ids, embeddings, batch_size):
+                attempts = 0
+                while True:
+                    try:
+                        write = collection.upsert if upsert else collection.add
+                        write(**batch)
+                        logger.info("Added batch %d-%d of %d documents to '%s'", start, end, n, collection_name)
+                        break
+                    except _TRANSPORT_ERRORS as e:
+                        attempts += 1
+                        self._on_batch_transport_error(attempts, e)
+                        time.sleep(self._backoff_delay(attempts))
+                        self._connect()
+                        collection = self.get_or_create_collection(collection_name)
+                    except Exception as e:
+                        self._on_operation_error(collection_name, "add documents", e)
+                        raise
+        finally:
+            self.invalidate_cache(collection_name)
+        logger.info("Successfully added %d documents to '%s'", n, collection_name)
+    
+    def get_existing_ids(self, collection_name: str, ids: List[str]) -> set:
+        """Return which of the given IDs are already stored in a collection."""
+        collection = self.get_or_create_collection(collection_name)
+        
+        try:
+            return set(collection.get(ids=ids, include=[])["ids"])
         except Exception as e:
-            logger.error(f"Failed to add documents: {str(e)}")
+            self._on_operation_error(collection_name, "look up existing IDs", e)
             raise
-
+    
     def query_collection(
         self,
         collection_name: str,
-        query_texts: List[str] | str,
+        query_texts: List[str] | str | None = None,
         n_results: int = 3,
         where: Optional[Dict[str, Any]] = None,
-        where_document: Optional[Dict[str, Any]] = None
+        where_document: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[np.ndarray] = None
     ) -> Dict[str, Any]:
-        """Query a collection with proper error handling."""
+        """Query a collection with caching and proper error handling.
+        
+        Multiple query texts are sent as concurrent single-text queries and merged.
+        Precomputed query_embeddings, when given, are sent as-is and query_texts is ignored.
+        """
+        if query_embeddings is not None:
+            return self._query_embeddings(collection_name, query_embeddings, n_results, where, where_document)
+        if query_texts is None:
+            raise ValueError("Either query_texts or query_embeddings must be provided")
+        
+        if isinstance(query_texts, str):
+            query_texts = [query_texts]
+        if not query_texts:
+            raise ValueError("query_texts must not be empty")
+        
+        if len(query_texts) == 1:
+            return self._query_single(collection_name, query_texts[0], n_results, where, where_document)
+        
+        # Serve cache hits inline and only hand misses to the pool
+        results: List[Optional[Dict[str, Any]]] = [None] * len(query_texts)
+        futures = {}
+        for i, query_text in enumerate(query_texts):
+            key = self._query_cache_key(collection_name, [query_text], n_results, where, where_document)
+            cached = self._get_cached(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                futures[i] = self._executor.submit(
+                    self._query_single, collection_name, query_text, n_results, where, where_document
+                )
+        for i, future in futures.items():
+            results[i] = future.result()
+        
+        return self._merge_results(results)
+    
+    def _query_embeddings(
+        self,
+        collection_name: str,
+        query_embeddings: Union[List[List[float]], np.ndarray],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        where_document: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Query a collection with precomputed embeddings, skipping text embedding."""
+        query_embeddings = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
         collection = self.get_or_create_collection(collection_name)
         
         try:
-            if isinstance(query_texts, str):
-                query_texts = [query_texts]
-                
             results = collection.query(
-                query_texts=query_texts,
+                query_embeddings=query_embeddings,
                 n_results=n_results,
                 where=where,
                 where_document=where_document
             )
-            logger.info(f"Successfully queried collection '{collection_name}'")
+            logger.info("Successfully queried collection '%s' by embedding", collection_name)
             return results
         except Exception as e:
-            logger.error(f"Failed to query collection: {str(e)}")
+            self._on_operation_error(collection_name, "query collection", e)
+            raise
+    
+    def _query_single(
+        self,
+        collection_name: str,
+        query_text: str,
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        where_document: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Run one query text through the caches and, on a miss, the server."""
+        key = self._query_cache_key(collection_name, [query_text], n_results, where, where_document)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        
+        semantic_context = None
+        query_vector = None
+        if self._semantic_cache is not None:
+            semantic_context = (key[0], self._query_cache_key(collection_name, [], n_results, where, where_document)[1])
+            try:
+                if self.embedding_function is not None:
+                    query_vector = self._semantic_cache.normalize(self._embed_query(query_text))
+                else:
+                    query_vector = self._semantic_cache.embed(query_text)
+            except Exception as e:
+                # The semantic cache is an optimization; without an embedding just ask the server
+                logger.warning("Semantic cache lookup skipped, could not embed query: %s", e)
+            if query_vector is not None:
+                cached = self._semantic_cache.get(semantic_context, query_vector)
+                if cached is not None:
+                    self._count_hit()
+                    logger.info("Semantic cache hit for query on collection '%s'", collection_name)
+                    return copy.deepcopy(cached)
+        
+        self._count_miss()
+        
+        collection = self.get_or_create_collection(collection_name)
+        
+        try:
+            if self.embedding_function is not None:
+                query = {"query_embeddings": np.atleast_2d(self._embed_query(query_text))}
+            else:
+                query = {"query_texts": [query_text]}
+            results = collection.query(
+                **query,
+                n_results=n_results,
+                where=where,
+                where_document=where_document
+            )
+            self._store_cached(key, results)
+            if query_vector is not None:
+                self._semantic_cache.put(semantic_context, query_vector, copy.deepcopy(results))
+            logger.info("Successfully queried collection '%s'", collection_name)
+            return results
+        except Exception as e:
+            self._on_operation_error(collection_name, "query collection", e)
             raise
 
 
+class AsyncChromaDBClient(_BaseChromaDBClient):
+    """An asyncio twin of ChromaDBClient built on chromadb.AsyncHttpClient.
+    
+    Construct with ``await AsyncChromaDBClient.create(...)`` since connecting is asynchronous.
+    It supports embedding_function and query_embeddings like ChromaDBClient, but has no
+    semantic cache.
+    """
+    
+    @classmethod
+    async def create(cls, **kwargs: Any) -> "AsyncChromaDBClient":
+        """Create a client and connect it to ChromaDB."""
+        self = cls(**kwargs)
+        await self._connect()
+        return self
+    
+    async def _connect(self) -> None:
+        """Establish connection to ChromaDB with retries."""
+        attempts = 0
+        while attempts < self.max_retries:
+            self._breaker.allow_request()
+            try:
+                self._log_connect_attempt(attempts)
+                # chromadb's async transport has no timeout, so check liveness first with a hard deadline
+                await self._preflight()
+                self.client = await chromadb.AsyncHttpClient(
+                    host=self.host,
+                    port=self.port,
+                    ssl=self.ssl,
+                    headers=self.headers,
+                    settings=self.settings
+                )
+                self._on_connected(await self._get_max_batch_size())
+                return
+            except Exception as e:
+                attempts += 1
+                self._on_connect_failure(attempts, e)
+                await asyncio.sleep(self._backoff_delay(attempts))
+    
+    async def _preflight(self) -> None:
+        """GET the heartbeat endpoint with a short timeout so a stuck server fails fast."""
+        async with httpx.AsyncClient(verify=self._ssl_verify(), timeout=self.heartbeat_timeout) as http:
+            response = await http.get(self._heartbeat_url(), headers=self.headers)
+        response.raise_for_status()
+    
+    async def _get_max_batch_size(self) -> Optional[int]:
+        """Return the server's maximum batch size, if the client exposes it."""
+        try:
+            return await self.client.get_max_batch_size()
+        except Exception as e:
+            logger.warning("Could not determine max batch size: %s", e)
+            return None
+    
+    async def get_or_create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None) -> Any:
+        """Get or create a collection with retries, reusing cached handles."""
+        if name in self._collections:
+            return self._collections[name]
+        
+        if not self._breaker.closed:
+            # Reconnect through the breaker so a half-open trial is admitted once and recorded
+            await self._connect()
+        attempts = 0
+        while attempts < self.max_retries:
+            try:
+                collection = await self.client.get_or_create_collection(
+                    name=name, metadata=metadata, **self._collection_kwargs()
+                )
+                self._collections[name] = collection
+                logger.info("Collection '%s' accessed successfully", name)
+                return collection
+            except Exception as e:
+                attempts += 1
+                reconnect = self._on_collection_failure(attempts, e)
+                await asyncio.sleep(self._backoff_delay(attempts))
+                
+                if reconnect:
+                    logger.info("Attempting to reconnect to ChromaDB")
+                    await self._connect()
+    
+    async def add_documents(
+        self,
+        collection_name: str,
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
+        batch_size: int = 5000,
+        upsert: bool = True
+    ) -> None:
+        """Add documents to a collection in batches with proper error handling."""
+        collection = await self.get_or_create_collection(collection_name)
+        n = len(documents)
+        
+        # Earlier batches may already be written when a later one fails
+        try:
+            for start, end, batch in self._batches(documents, metadatas, ids, embeddings, batch_size):
+                attempts = 0
+                while True:
+                    try:
+                        write = collection.upsert if upsert else collection.add
+                        await write(**batch)
+                        logger.info("Added batch %d-%d of %d documents to '%s'", start, end, n, collection_name)
+                        break
+                    except _TRANSPORT_ERRORS as e:
+                        attempts += 1
+                        self._on_batch_transport_error(attempts, e)
+                        await asyncio.sleep(self._backoff_delay(attempts))
+                        await self._connect()
+                        collection = await self.get_or_create_collection(collection_name)
+                    except Exception as e:
+                        self._on_operation_error(collection_name, "add documents", e)
+                        raise
+        finally:
+            self.invalidate_cache(collection_name)
+        logger.info("Successfully added %d documents to '%s'", n, collection_name)
+    
+    async def get_existing_ids(self, collection_name: str, ids: List[str]) -> set:
+        """Return which of the given IDs are already stored in a collection."""
+        collection = await self.get_or_create_collection(collection_name)
+        
+        try:
+            return set((await collection.get(ids=ids, include=[]))["ids"])
+        except Exception as e:
+            self._on_operation_error(collection_name, "look up existing IDs", e)
+            raise
+    
+    async def query_collection(
+        self,
+        collection_name: str,
+        query_texts: List[str] | str | None = None,
+        n_results: int = 3,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
+        """Query a collection with caching, running multiple query texts concurrently.
+        
+        Precomputed query_embeddings, when given, are sent as-is and query_texts is ignored.
+        """
+        if query_embeddings is not None:
+            return await self._query_embeddings(collection_name, query_embeddings, n_results, where, where_document)
+        if query_texts is None:
+            raise ValueError("Either query_texts or query_embeddings must be provided")
+        
+        if isinstance(query_texts, str):
+            query_texts = [query_texts]
+        if not query_texts:
+            raise ValueError("query_texts must not be empty")
+        
+        results = await asyncio.gather(*[
+            self._query_single(collection_name, query_text, n_results, where, where_document)
+            for query_text in query_texts
+        ])
+        return results[0] if len(results) == 1 else self._merge_results(list(results))
+    
+    async def _query_embeddings(
+        self,
+        collection_name: str,
+        query_embeddings: Union[List[List[float]], np.ndarray],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        where_document: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Query a collection with precomputed embeddings, skipping text embedding."""
+        query_embeddings = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        collection = await self.get_or_create_collection(collection_name)
+        
+        try:
+            results = await collection.query(
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                where=where,
+                where_document=where_document
+            )
+            logger.info("Successfully queried collection '%s' by embedding", collection_name)
+            return results
+        except Exception as e:
+            self._on_operation_error(collection_name, "query collection", e)
+            raise
+    
+    async def _query_single(
+        self,
+        collection_name: str,
+        query_text: str,
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        where_document: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Run one query text through the cache and, on a miss, the server."""
+        key = self._query_cache_key(collection_name, [query_text], n_results, where, where_document)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        self._count_miss()
+        
+        collection = await self.get_or_create_collection(collection_name)
+        
+        try:
+            if self.embedding_function is not None:
+                # Embedding is CPU-bound; keep it off the event loop
+                vector = await asyncio.to_thread(self._embed_query, query_text)
+                query = {"query_embeddings": np.atleast_2d(vector)}
+            else:
+                query = {"query_texts": [query_text]}
+            results = await collection.query(
+                **query,
+                n_results=n_results,
+                where=where,
+                where_document=where_document
+            )
+            self._store_cached(key, results)
+            logger.info("Successfully queried collection '%s'", collection_name)
+            return results
+        except Exception as e:
+            self._on_operation_error(collection_name, "query collection", e)
+            raise
+
+
+class AsyncIngestQueue:
+    """Fire-and-forget ingestion: documents are buffered and written by a background thread.
+    
+    The worker flushes a micro-batch through add_documents once flush_size documents
+    are buffered or flush_ms milliseconds have passed since the first one, whichever
+    comes first. Failed writes are counted and raised from the next flush(). The queue
+    is closed at interpreter exit unless close() was called first.
+    """
+    
+    _STOP = object()
+    
+    def __init__(
+        self,
+        client: ChromaDBClient,
+        collection_name: str,
+        flush_size: int = 500,
+        flush_ms: int = 100
+    ):
+        self.client = client
+        self.collection_name = collection_name
+        self.flush_size = flush_size
+        self.flush_interval = flush_ms / 1000
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._failed = 0
+        self._last_error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, name="chroma-ingest", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, document: str, metadata: Optional[Dict[str, Any]] = None, doc_id: Optional[str] = None) -> None:
+        """Queue a document for ingestion and return immediately."""
+        if self._closed:
+            raise RuntimeError(f"Ingest queue for '{self.collection_name}' is closed")
+        if doc_id is None:
+            doc_id = secrets.token_hex(16)
+        self._queue.put((document, metadata, doc_id))
+    
+    def flush(self) -> None:
+        """Block until every submitted document has been written or has failed.
+        
+        Raises RuntimeError if any documents failed since the last flush.
+        """
+        self._queue.join()
+        with self._lock:
+            failed, error = self._failed, self._last_error
+            self._failed, self._last_error = 0, None
+        if failed:
+            raise RuntimeError(f"Failed to ingest {failed} queued documents into '{self.collection_name}'") from error
+    
+    def close(self) -> None:
+        """Flush pending documents, then stop the worker thread."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.flush()
+        finally:
+            self._queue.put(self._STOP)
+            self._thread.join()
+            atexit.unregister(self.close)
+    
+    def _run(self) -> None:
+        """Worker loop: collect a micro-batch, then write it."""
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.flush_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    # Put the sentinel back so the loop exits once this batch is written
+                    self._queue.task_done()
+                    self._queue.put(item)
+                    break
+                batch.append(item)
+            
+            try:
+                for group in self._groups(batch):
+                    try:
+                        self._write(group)
+                    except Exception as e:
+                        with self._lock:
+                            self._failed += len(group)
+                            self._last_error = e
+                        logger.error("Failed to ingest %d queued documents into '%s': %s", len(group), self.collection_name, e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    @staticmethod
+    def _groups(batch: List[tuple]) -> Iterator[List[tuple]]:
+        """Split a micro-batch into consecutive runs that all have, or all lack, metadata.
+        
+        Chroma takes either no metadatas or one per document, so a mixed batch can't be
+        written in a single call.
+        """
+        for _, group in itertools.groupby(batch, key=lambda item: item[1] is None):
+            yield list(group)
+    
+    def _write(self, batch: List[tuple]) -> None:
+        """Write one run of (document, metadata, id) tuples."""
+        documents, metadatas, ids = (list(column) for column in zip(*batch))
+        self.client.add_documents(
+            collection_name=self.collection_name,
+            documents=documents,
+            metadatas=None if metadatas[0] is None else metadatas,
+            ids=ids
+        )
+
+
+_client_singleton: Optional[ChromaDBClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client(**kwargs: Any) -> ChromaDBClient:
+    """Return a process-wide ChromaDBClient, creating it on first use.
+    
+    Keyword arguments are only used when the client is first created.
+    """
+    global _client_singleton
+    with _client_lock:
+        if _client_singleton is None:
+            _client_singleton = ChromaDBClient(**kwargs)
+        return _client_singleton
+
+
+_ADDED_DATE = '2025-04-15'
+
+
+def _sample_metadata(source: str) -> Dict[str, Any]:
+    """Build the metadata dict for a sample document."""
+    return {'source': source, 'added_date': _ADDED_DATE}
+
+
+_DOCUMENTS = (
+    "Mars, often called the 'Red Planet', has captured the imagination of scientists and space enthusiasts alike.",
+    "The Hubble Space Telescope has provided us with breathtaking images of distant galaxies and nebulae.",
+    "The concept of a black hole, where gravity is so strong that nothing can escape it, was first theorized by Albert Einstein's theory of general relativity.",
+    "The Renaissance was a pivotal period in history that saw a flourishing of art, science, and culture in Europe.",
+    "The Industrial Revolution marked a significant shift in human society, leading to urbanization and technological advancements.",
+    "The ancient city of Rome was once the center of a powerful empire that spanned across three continents.",
+    "Dolphins are known for their high intelligence and social behavior, often displaying playful interactions with humans.",
+    "The chameleon is a remarkable creature that can change its skin color to blend into its surroundings or communicate with other chameleons.",
+    "The migration of monarch butterflies spans thousands of miles and involves multiple generations to complete.",
+    "Christopher Nolan's 'Inception' is a mind-bending movie that explores the boundaries of reality and dreams.",
+    "The 'Lord of the Rings' trilogy, directed by Peter Jackson, brought J.R.R. Tolkien's epic fantasy world to life on the big screen.",
+    "Pixar's 'Toy Story' was the first feature-length film entirely animated using computer-generated imagery (CGI).",
+    "Superman, known for his incredible strength and ability to fly, is one of the most iconic superheroes in comic book history.",
+    "Black Widow, portrayed by Scarlett Johansson, is a skilled spy and assassin in the Marvel Cinematic Universe.",
+    "The character of Iron Man, played by Robert Downey Jr., kickstarted the immensely successful Marvel movie franchise in 2008."
+)
+
+_METADATAS = tuple(
+    _sample_metadata(source)
+    for source in ("Space", "History", "Animals", "Movies", "Superheroes")
+    for _ in range(3)
+)
+
+
+_SAMPLE_COLLECTION = "sample_collection"
+
+_DEMO_QUERIES = (
+    # 1. Plain semantic query
+    {"query_texts": "Give me some facts about space", "n_results": 3},
+    # 2. Query with category filter
+    {"query_texts": "Tell me about superheroes", "n_results": 3, "where": {"source": "Superheroes"}},
+    # 3. Multi-query example
+    {"query_texts": ["Tell me about animals", "Tell me about movies"], "n_results": 2}
+)
+
+
+def _sample_ids() -> List[str]:
+    return [f"doc_{i+1}" for i in range(len(_DOCUMENTS))]
+
+
+def _missing_samples(ids: List[str], existing: set) -> Optional[Dict[str, Any]]:
+    """Build add_documents arguments for sample documents not yet stored, or None if all are."""
+    missing_idx = [i for i, doc_id in enumerate(ids) if doc_id not in existing]
+    if not missing_idx:
+        logger.info("All %d sample documents already present in '%s'", len(ids), _SAMPLE_COLLECTION)
+        return None
+    return {
+        "collection_name": _SAMPLE_COLLECTION,
+        "documents": [_DOCUMENTS[i] for i in missing_idx],
+        "metadatas": [_METADATAS[i] for i in missing_idx],
+        "ids": [ids[i] for i in missing_idx]
+    }
+
+
 def load_sample_data(chroma_client: ChromaDBClient) -> None:
-    """Load sample data into ChromaDB."""
-    documents = [
-        "Mars, often called the 'Red Planet', has captured the imagination of scientists and space enthusiasts alike.",
-        "The Hubble Space Telescope has provided us with breathtaking images of distant galaxies and nebulae.",
-        "The concept of a black hole, where gravity is so strong that nothing can escape it, was first theorized by Albert Einstein's theory of general relativity.",
-        "The Renaissance was a pivotal period in history that saw a flourishing of art, science, and culture in Europe.",
-        "The Industrial Revolution marked a significant shift in human society, leading to urbanization and technological advancements.",
-        "The ancient city of Rome was once the center of a powerful empire that spanned across three continents.",
-        "Dolphins are known for their high intelligence and social behavior, often displaying playful interactions with humans.",
-        "The chameleon is a remarkable creature that can change its skin color to blend into its surroundings or communicate with other chameleons.",
-        "The migration of monarch butterflies spans thousands of miles and involves multiple generations to complete.",
-        "Christopher Nolan's 'Inception' is a mind-bending movie that explores the boundaries of reality and dreams.",
-        "The 'Lord of the Rings' trilogy, directed by Peter Jackson, brought J.R.R. Tolkien's epic fantasy world to life on the big screen.",
-        "Pixar's 'Toy Story' was the first feature-length film entirely animated using computer-generated imagery (CGI).",
-        "Superman, known for his incredible strength and ability to fly, is one of the most iconic superheroes in comic book history.",
-        "Black Widow, portrayed by Scarlett Johansson, is a skilled spy and assassin in the Marvel Cinematic Universe.",
-        "The character of Iron Man, played by Robert Downey Jr., kickstarted the immensely successful Marvel movie franchise in 2008."
-    ]
-
-    metadatas = [
-        {'source': "Space", 'added_date': '2025-04-15'}, 
-        {'source': "Space", 'added_date': '2025-04-15'}, 
-        {'source': "Space", 'added_date': '2025-04-15'}, 
-        {'source': "History", 'added_date': '2025-04-15'}, 
-        {'source': "History", 'added_date': '2025-04-15'}, 
-        {'source': "History", 'added_date': '2025-04-15'}, 
-        {'source': "Animals", 'added_date': '2025-04-15'}, 
-        {'source': "Animals", 'added_date': '2025-04-15'}, 
-        {'source': "Animals", 'added_date': '2025-04-15'}, 
-        {'source': "Movies", 'added_date': '2025-04-15'}, 
-        {'source': "Movies", 'added_date': '2025-04-15'}, 
-        {'source': "Movies", 'added_date': '2025-04-15'}, 
-        {'source': "Superheroes", 'added_date': '2025-04-15'}, 
-        {'source': "Superheroes", 'added_date': '2025-04-15'}, 
-        {'source': "Superheroes", 'added_date': '2025-04-15'}
-    ]
-    
-    ids = [f"doc_{i+1}" for i in range(len(documents))]
-
-    chroma_client.add_documents(
-        collection_name="sample_collection",
-        documents=documents,
-        metadatas=metadatas,
-        ids=ids
-    )
+    """Load sample data into ChromaDB, skipping documents that are already present."""
+    ids = _sample_ids()
+    missing = _missing_samples(ids, chroma_client.get_existing_ids(_SAMPLE_COLLECTION, ids))
+    if missing:
+        chroma_client.add_documents(**missing)
+
+
+async def async_load_sample_data(chroma_client: AsyncChromaDBClient) -> None:
+    """Load sample data into ChromaDB asynchronously, skipping documents that are already present."""
+    ids = _sample_ids()
+    missing = _missing_samples(ids, await chroma_client.get_existing_ids(_SAMPLE_COLLECTION, ids))
+    if missing:
+        await chroma_client.add_documents(**missing)
+
+
+def _demo_endpoint() -> tuple:
+    return os.environ.get("CHROMA_HOST", "chroma"), int(os.environ.get("CHROMA_PORT", "8000"))
+
+
+def _print_demo_results(
+    space_results: Dict[str, Any],
+    superhero_results: Dict[str, Any],
+    multi_results: Dict[str, Any]
+) -> None:
+    """Print the results of the three _DEMO_QUERIES."""
+    print("\n--- Space Facts Query Results ---")
+    for doc in space_results["documents"][0]:
+        print(f"• {doc}")
+    
+    print("\n--- Superhero Query Results ---")
+    for doc in superhero_results["documents"][0]:
+        print(f"• {doc}")
+    
+    print("\n--- Multi-Query Results ---")
+    print("Animals Query:")
+    for doc in multi_results["documents"][0]:
+        print(f"• {doc}")
+        
+    print("\nMovies Query:")
+    for doc in multi_results["documents"][1]:
+        print(f"• {doc}")
 
 
 def main():
     """Main function to demonstrate ChromaDB usage."""
-    host = os.environ.get("CHROMA_HOST", "chroma")
-    port = int(os.environ.get("CHROMA_PORT", "8000"))
+    host, port = _demo_endpoint()
     
     try:
-        chroma_client = ChromaDBClient(host=host, port=port)
+        chroma_client = get_client(host=host, port=port)
         
         # Load sample data
         load_sample_data(chroma_client)
 
         print("\n--- Loaded the data sucessfully ---")
 
-        results = chroma_client.query_collection(
-            collection_name="sample_collection",
-            query_texts="Give me some facts about space",
-            n_results=3
-        )
-        
-        print("\n--- Space Facts Query Results ---")
-        for doc in results["documents"][0]:
-            print(f"• {doc}")
+        _print_demo_results(*[
+            chroma_client.query_collection(collection_name=_SAMPLE_COLLECTION, **query)
+            for query in _DEMO_QUERIES
+        ])
             
-        # 2. Query with category filter
-        results = chroma_client.query_collection(
-            collection_name="sample_collection",
-            query_texts="Tell me about superheroes",
-            n_results=3,
-            where={"source": "Superheroes"}
-        )
-        
-        print("\n--- Superhero Query Results ---")
-        for doc in results["documents"][0]:
-            print(f"• {doc}")
-            
-        # 3. Multi-query example
-        multi_results = chroma_client.query_collection(
-            collection_name="sample_collection",
-            query_texts=["Tell me about animals", "Tell me about movies"],
-            n_results=2
-        )
+    except Exception as e:
+        logger.error("An error occurred: %s", e)
+        raise
+
+
+async def async_main():
+    """Async variant of main() that issues the independent demo queries concurrently."""
+    host, port = _demo_endpoint()
+    
+    try:
+        chroma_client = await AsyncChromaDBClient.create(host=host, port=port)
         
-        print("\n--- Multi-Query Results ---")
-        print("Animals Query:")
-        for doc in multi_results["documents"][0]:
-            print(f"• {doc}")
-            
-        print("\nMovies Query:")
-        for doc in multi_results["documents"][1]:
-            print(f"• {doc}")
+        await async_load_sample_data(chroma_client)
+
+        print("\n--- Loaded the data sucessfully ---")
+
+        _print_demo_results(*await asyncio.gather(*[
+            chroma_client.query_collection(collection_name=_SAMPLE_COLLECTION, **query)
+            for query in _DEMO_QUERIES
+        ]))
             
     except Exception as e:
-        logger.error(f"An error occurred: {str(e)}")
+        logger.error("An error occurred: %s", e)
         raise
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if os.environ.get("CHROMA_ASYNC", "").lower() in ("1", "true", "yes"):
+        asyncio.run(async_main())
+    else:
+        main()
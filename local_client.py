@@ -50,7 +50,8 @@ def get_collection_info(client: chromadb.HttpClient, collection_name: str) -> Di
         print(f"Number of documents: {count}")
         
         if count > 0:
-            sample = collection.peek(limit=3)
+            # peek() always returns embeddings; fetch only what is printed
+            sample = collection.get(limit=3, include=["documents", "metadatas"])
             print(f"Sample documents:")
             for idx, (doc_id, doc, metadata) in enumerate(zip(sample['ids'], sample['documents'], sample['metadatas']), 1):
                 print(f"  {idx}. ID: {doc_id}")
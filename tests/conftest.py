@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import client  # noqa: E402
+
+
+class StubCollection:
+    """Records calls and answers queries with a result naming the call number."""
+    
+    def __init__(self):
+        self.queries = []
+        self.writes = []
+        self.fail_writes_from = None
+    
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        return {"ids": [[f"result-{len(self.queries)}"]], "distances": [[0.0]], "included": ["distances"]}
+    
+    def upsert(self, **kwargs):
+        if self.fail_writes_from is not None and len(self.writes) >= self.fail_writes_from:
+            raise ValueError("write rejected")
+        self.writes.append(kwargs)
+    
+    add = upsert
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """Build a ChromaDBClient that never connects and serves one stub collection."""
+    monkeypatch.setattr(client.ChromaDBClient, "_connect", lambda self: None)
+    
+    def make(**kwargs):
+        c = client.ChromaDBClient(host="stub", port=0, **kwargs)
+        collection = StubCollection()
+        c.get_or_create_collection = lambda name, metadata=None: collection
+        return c, collection
+    
+    return make
@@ -0,0 +1,64 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from client import AsyncChromaDBClient
+
+
+class AsyncStubCollection:
+    def __init__(self):
+        self.queries = []
+    
+    async def query(self, **kwargs):
+        self.queries.append(kwargs)
+        return {"ids": [[f"result-{len(self.queries)}"]], "included": []}
+
+
+class AsyncStubServer:
+    def __init__(self):
+        self.collection = AsyncStubCollection()
+        self.created = []
+    
+    async def get_or_create_collection(self, **kwargs):
+        self.created.append(kwargs)
+        return self.collection
+
+
+def make_async_client(**kwargs):
+    c = AsyncChromaDBClient(host="stub", port=0, **kwargs)
+    c.client = AsyncStubServer()
+    return c
+
+
+def embed(texts):
+    return [np.ones(3) for _ in texts]
+
+
+def test_embedding_function_is_used_for_collections_and_queries():
+    c = make_async_client(embedding_function=embed)
+    asyncio.run(c.query_collection("coll", "q"))
+    assert c.client.created[0]["embedding_function"] is embed
+    query = c.client.collection.queries[0]
+    assert "query_texts" not in query
+    assert query["query_embeddings"].shape == (1, 3)
+
+
+def test_query_embeddings_bypass_text_embedding():
+    c = make_async_client()
+    asyncio.run(c.query_collection("coll", query_embeddings=[0.1, 0.2, 0.3]))
+    query = c.client.collection.queries[0]
+    assert query["query_embeddings"].dtype == np.float32
+    assert query["query_embeddings"].shape == (1, 3)
+
+
+def test_multi_text_queries_are_merged():
+    c = make_async_client()
+    result = asyncio.run(c.query_collection("coll", ["a", "b"]))
+    assert len(result["ids"]) == 2
+
+
+def test_empty_query_texts_are_rejected():
+    c = make_async_client()
+    with pytest.raises(ValueError):
+        asyncio.run(c.query_collection("coll", []))
@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from client import ChromaDBClient, _BaseChromaDBClient
+
+
+@pytest.mark.parametrize("attempts", range(1, 8))
+def test_backoff_delay_stays_within_capped_window(attempts):
+    client = _BaseChromaDBClient(retry_delay=2, retry_cap=30, rng=random.Random(0))
+    upper = min(30, 2 * (2 ** attempts))
+    delays = [client._backoff_delay(attempts) for _ in range(200)]
+    assert all(0 <= d <= upper for d in delays)
+
+
+def test_backoff_delay_never_exceeds_cap():
+    client = _BaseChromaDBClient(retry_delay=2, retry_cap=5, rng=random.Random(0))
+    assert max(client._backoff_delay(20) for _ in range(200)) <= 5
+
+
+def test_backoff_delay_is_reproducible_with_seeded_rng():
+    first = _BaseChromaDBClient(rng=random.Random(42))
+    second = _BaseChromaDBClient(rng=random.Random(42))
+    assert [first._backoff_delay(3) for _ in range(5)] == [second._backoff_delay(3) for _ in range(5)]
+
+
+def test_positional_arguments_keep_their_original_meaning(monkeypatch):
+    monkeypatch.setattr(ChromaDBClient, "_connect", lambda self: None)
+    client = ChromaDBClient("chroma", 8000, 5, 2, False)
+    assert client.settings.allow_reset is False
+    assert client.retry_cap == 30
@@ -0,0 +1,81 @@
+import pytest
+
+import client
+from client import CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(client.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_opens_at_failure_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(ConnectionError):
+        breaker.allow_request()
+
+
+def test_half_open_admits_a_single_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock[0] += 10
+    breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(ConnectionError):
+        breaker.allow_request()
+
+
+def test_successful_trial_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock[0] += 10
+    breaker.allow_request()
+    breaker.record_success()
+    assert breaker.closed
+    assert breaker.failures == 0
+    breaker.allow_request()
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 10
+    breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(ConnectionError):
+        breaker.allow_request()
+
+
+def test_abandoned_trial_is_replaced_after_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock[0] += 10
+    breaker.allow_request()
+    clock[0] += 10
+    breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_breakers_are_shared_per_endpoint():
+    assert CircuitBreaker.for_endpoint("a", 8000) is CircuitBreaker.for_endpoint("a", 8000)
+    assert CircuitBreaker.for_endpoint("a", 8000) is not CircuitBreaker.for_endpoint("b", 8000)
+    assert CircuitBreaker.for_endpoint("a", 8000) is not CircuitBreaker.for_endpoint("a", 8001)
+
+
+def test_clients_of_different_hosts_do_not_share_a_breaker():
+    down = client._BaseChromaDBClient(host="down-host", port=8000)
+    up = client._BaseChromaDBClient(host="up-host", port=8000)
+    for _ in range(down._breaker.failure_threshold):
+        down._breaker.record_failure()
+    with pytest.raises(ConnectionError):
+        down._breaker.allow_request()
+    up._breaker.allow_request()
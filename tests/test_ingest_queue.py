@@ -0,0 +1,93 @@
+import atexit
+
+import pytest
+
+from client import AsyncIngestQueue
+
+
+class StubClient:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+    
+    def add_documents(self, collection_name, documents, metadatas=None, ids=None):
+        if self.fail:
+            raise ValueError("write failed")
+        self.calls.append({"documents": documents, "metadatas": metadatas, "ids": ids})
+
+
+@pytest.fixture
+def make_queue():
+    queues = []
+    
+    def make(client, **kwargs):
+        q = AsyncIngestQueue(client, "docs", **kwargs)
+        queues.append(q)
+        return q
+    
+    yield make
+    for q in queues:
+        try:
+            q.close()
+        except RuntimeError:
+            pass
+
+
+def test_flush_writes_submitted_documents(make_queue):
+    stub = StubClient()
+    q = make_queue(stub, flush_size=10, flush_ms=50)
+    for i in range(3):
+        q.submit(f"doc {i}", {"n": i}, doc_id=str(i))
+    q.flush()
+    assert [c["ids"] for c in stub.calls] == [["0", "1", "2"]]
+    assert stub.calls[0]["metadatas"] == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+
+def test_batches_respect_flush_size(make_queue):
+    stub = StubClient()
+    q = make_queue(stub, flush_size=2, flush_ms=1000)
+    for i in range(5):
+        q.submit(f"doc {i}", doc_id=str(i))
+    q.flush()
+    assert all(len(c["ids"]) <= 2 for c in stub.calls)
+    assert [i for c in stub.calls for i in c["ids"]] == ["0", "1", "2", "3", "4"]
+
+
+def test_mixed_metadata_is_split_into_groups():
+    batch = [("a", None, "1"), ("b", {"k": 1}, "2"), ("c", {"k": 2}, "3"), ("d", None, "4")]
+    groups = list(AsyncIngestQueue._groups(batch))
+    assert [[item[2] for item in g] for g in groups] == [["1"], ["2", "3"], ["4"]]
+
+
+def test_mixed_metadata_never_passes_none_entries(make_queue):
+    stub = StubClient()
+    q = make_queue(stub, flush_size=10, flush_ms=50)
+    q.submit("a", None, doc_id="1")
+    q.submit("b", {"k": 1}, doc_id="2")
+    q.flush()
+    for call in stub.calls:
+        assert call["metadatas"] is None or None not in call["metadatas"]
+    assert sorted(i for c in stub.calls for i in c["ids"]) == ["1", "2"]
+
+
+def test_flush_raises_after_failed_writes(make_queue):
+    q = make_queue(StubClient(fail=True), flush_size=10, flush_ms=10)
+    q.submit("a", doc_id="1")
+    q.submit("b", doc_id="2")
+    with pytest.raises(RuntimeError, match="2 queued documents"):
+        q.flush()
+    q.flush()
+
+
+def test_close_stops_worker_and_unregisters(make_queue, monkeypatch):
+    unregistered = []
+    monkeypatch.setattr(atexit, "unregister", unregistered.append)
+    stub = StubClient()
+    q = make_queue(stub, flush_size=10, flush_ms=10)
+    q.submit("a", doc_id="1")
+    q.close()
+    assert not q._thread.is_alive()
+    assert stub.calls[0]["ids"] == ["1"]
+    assert unregistered == [q.close]
+    with pytest.raises(RuntimeError):
+        q.submit("b")
@@ -0,0 +1,43 @@
+import asyncio
+import socket
+import time
+
+import httpx
+import pytest
+
+from client import AsyncChromaDBClient, ChromaDBClient, _BaseChromaDBClient
+
+
+@pytest.fixture
+def stuck_server():
+    """A server that accepts connections and never answers."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(8)
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+def test_heartbeat_url_follows_ssl_and_api_path():
+    plain = _BaseChromaDBClient(host="db", port=8000)
+    secure = _BaseChromaDBClient(host="db", port=8443, ssl=True)
+    assert plain._heartbeat_url().startswith("http://db:8000/api/")
+    assert secure._heartbeat_url().startswith("https://db:8443/api/")
+    assert plain._heartbeat_url().endswith("/heartbeat")
+
+
+def test_sync_preflight_times_out_on_stuck_server(stuck_server, monkeypatch):
+    monkeypatch.setattr(ChromaDBClient, "_connect", lambda self: None)
+    client = ChromaDBClient(host="127.0.0.1", port=stuck_server, heartbeat_timeout=0.2)
+    start = time.monotonic()
+    with pytest.raises(httpx.TimeoutException):
+        client._preflight()
+    assert time.monotonic() - start < 2
+
+
+def test_async_preflight_times_out_on_stuck_server(stuck_server):
+    client = AsyncChromaDBClient(host="127.0.0.1", port=stuck_server, heartbeat_timeout=0.2)
+    start = time.monotonic()
+    with pytest.raises(httpx.TimeoutException):
+        asyncio.run(client._preflight())
+    assert time.monotonic() - start < 2
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+
+def test_repeated_query_is_served_from_cache(make_client):
+    c, collection = make_client()
+    first = c.query_collection("coll", "q")
+    assert c.query_collection("coll", "q") == first
+    assert len(collection.queries) == 1
+
+
+@pytest.mark.parametrize("change", [{"n_results": 5}, {"where": {"genre": "space"}}, {"where_document": {"$contains": "x"}}])
+def test_cache_key_covers_query_parameters(make_client, change):
+    c, collection = make_client()
+    c.query_collection("coll", "q")
+    c.query_collection("coll", "q", **change)
+    assert len(collection.queries) == 2
+
+
+def test_add_documents_invalidates_collection(make_client):
+    c, collection = make_client()
+    c.query_collection("coll", "q")
+    c.add_documents("coll", ["doc"], ids=["1"])
+    c.query_collection("coll", "q")
+    assert len(collection.queries) == 2
+
+
+def test_add_documents_invalidates_even_when_a_later_batch_fails(make_client):
+    c, collection = make_client()
+    c.query_collection("coll", "q")
+    collection.fail_writes_from = 1
+    with pytest.raises(ValueError):
+        c.add_documents("coll", ["a", "b"], ids=["1", "2"], batch_size=1)
+    assert len(collection.writes) == 1
+    c.query_collection("coll", "q")
+    assert len(collection.queries) == 2
+
+
+def test_stats_count_hits_and_misses(make_client):
+    c, _ = make_client()
+    c.query_collection("coll", "q")
+    c.query_collection("coll", "q")
+    c.query_collection("coll", "other")
+    assert c.stats() == {"hits": 1, "misses": 2, "hit_rate": pytest.approx(1 / 3)}
+
+
+def test_stats_for_multi_text_queries(make_client):
+    c, _ = make_client()
+    c.query_collection("coll", "a")
+    c.query_collection("coll", ["a", "b"])
+    assert c.stats()["hits"] == 1
+    assert c.stats()["misses"] == 2
+
+
+def test_cache_maxsize_zero_disables_caching(make_client):
+    c, collection = make_client(cache_maxsize=0, embedding_function=lambda texts: [np.ones(3) for _ in texts])
+    assert c.query_collection("coll", "q")["ids"] == [["result-1"]]
+    assert c.query_collection("coll", "q")["ids"] == [["result-2"]]
+    assert c.stats()["hits"] == 0
+    c.invalidate_cache("coll")
+
+
+def test_empty_query_texts_are_rejected(make_client):
+    c, collection = make_client()
+    with pytest.raises(ValueError):
+        c.query_collection("coll", [])
+    assert collection.queries == []
@@ -0,0 +1,94 @@
+import time
+
+import numpy as np
+import pytest
+
+import client
+from client import SemanticQueryCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(client.time, "monotonic", lambda: now[0])
+    return now
+
+
+def unit(*values):
+    return SemanticQueryCache.normalize(values)
+
+
+def test_hit_above_threshold_and_miss_below():
+    cache = SemanticQueryCache(threshold=0.9, maxsize=4)
+    cache.put(("coll", b"ctx"), unit(1, 0), {"ids": [["a"]]})
+    assert cache.get(("coll", b"ctx"), unit(1, 0.1)) == {"ids": [["a"]]}
+    assert cache.get(("coll", b"ctx"), unit(0, 1)) is None
+
+
+def test_context_must_match():
+    cache = SemanticQueryCache(threshold=0.9, maxsize=4)
+    cache.put(("coll", b"ctx"), unit(1, 0), {"ids": [["a"]]})
+    assert cache.get(("coll", b"other"), unit(1, 0)) is None
+
+
+def test_invalidate_drops_only_that_collection():
+    cache = SemanticQueryCache(threshold=0.9, maxsize=4)
+    cache.put(("a", b"ctx"), unit(1, 0), {"ids": [["a"]]})
+    cache.put(("b", b"ctx"), unit(1, 0), {"ids": [["b"]]})
+    cache.invalidate("a")
+    assert cache.get(("a", b"ctx"), unit(1, 0)) is None
+    assert cache.get(("b", b"ctx"), unit(1, 0)) == {"ids": [["b"]]}
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used_when_full():
+    cache = SemanticQueryCache(threshold=0.99, maxsize=2)
+    cache.put(("c", b""), unit(1, 0), {"ids": [["x"]]})
+    cache.put(("c", b""), unit(0, 1), {"ids": [["y"]]})
+    cache.get(("c", b""), unit(1, 0))
+    cache.put(("c", b""), unit(1, 1), {"ids": [["z"]]})
+    assert len(cache) == 2
+    assert cache.get(("c", b""), unit(0, 1)) is None
+    assert cache.get(("c", b""), unit(1, 0)) == {"ids": [["x"]]}
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = SemanticQueryCache(threshold=0.9, maxsize=4, ttl=10)
+    cache.put(("c", b""), unit(1, 0), {"ids": [["old"]]})
+    clock[0] += 9
+    assert cache.get(("c", b""), unit(1, 0)) == {"ids": [["old"]]}
+    clock[0] += 1
+    assert cache.get(("c", b""), unit(1, 0)) is None
+    assert len(cache) == 0
+
+
+def test_vectors_are_stored_in_a_preallocated_buffer():
+    cache = SemanticQueryCache(maxsize=8)
+    cache.put(("c", b""), unit(1, 0, 0), {})
+    buffer = cache._vectors
+    cache.put(("c", b""), unit(0, 1, 0), {})
+    assert cache._vectors is buffer
+    assert buffer.shape == (8, 3)
+
+
+def test_client_rereads_after_cache_ttl(make_client):
+    c, collection = make_client(
+        semantic_cache=True, cache_ttl=0.2, embedding_function=lambda texts: [np.ones(3) for _ in texts]
+    )
+    first = c.query_collection("coll", "q")
+    time.sleep(0.3)
+    second = c.query_collection("coll", "q")
+    assert len(collection.queries) == 2
+    assert first != second
+
+
+def test_client_falls_back_to_server_when_embedding_fails(make_client):
+    c, collection = make_client(semantic_cache=True)
+    
+    def broken(texts):
+        raise RuntimeError("model download failed")
+    
+    c._semantic_cache._embedding_function = broken
+    assert c.query_collection("coll", "q")["ids"] == [["result-1"]]
+    assert len(collection.queries) == 1